@@ -15,17 +15,44 @@ Technical Notes:
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Query
+from functools import lru_cache
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Mapping, Optional
+from types import MappingProxyType
+from dataclasses import dataclass, field, replace
+import xml.etree.ElementTree as ET
 from sklearn.ensemble import IsolationForest
-import networkx as nx
-import json
+import joblib
+from joblib import parallel_backend
+import orjson
+import hashlib
+import itertools
 import math
-import random
+import os
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # Numba is optional - kernels run as plain Python without it
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    def vectorize(*args, **kwargs):
+        # Ufunc bodies are written with NumPy ops, so they already broadcast
+        return lambda func: func
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv  # multithreaded CSV parser
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pyarrow is optional - fall back to pandas' C parser
+    CSV_ENGINE = "c"
 
 
 # =============================================================================
@@ -41,6 +68,28 @@ async def lifespan(app):
     # Startup
     if anomaly_model is None:
         initialize_model()
+    
+    # Warm-up: compile the JIT kernels (or load them from Numba's cache) with
+    # the argument types requests use, so the first request doesn't pay for it
+    _flow_kernel(45.0, tank_state.level_m, tank_state.max_level_m, False, 1.0)
+    _flow_series_kernel(np.array([45.0]), np.ones(1), False, tank_state.level_m, tank_state.max_level_m, 0.0)
+    _haversine_from_leak(np.zeros(1), np.zeros(1), np.ones(1))
+    
+    # Warm the file-backed caches so the async handlers only touch memory
+    # (a first-request GraphML/JSON parse would otherwise block the event loop)
+    get_network()
+    warmers = (
+        load_users,
+        lambda: _users_payload(USERS_DATA_PATH.stat().st_mtime),
+        lambda: _satellite_payload(SATELLITE_DATA_PATH.stat().st_mtime),
+    )
+    for warm_cache in warmers:
+        try:
+            warm_cache()
+        except FileNotFoundError as e:
+            print(f"   ⚠️  {Path(e.filename).name} not found - dependent endpoints will return errors")
+        except Exception as e:  # e.g. malformed JSON - the endpoints report it per request
+            print(f"   ⚠️  Could not warm data cache ({e}) - dependent endpoints will return errors")
     print("\n" + "="*60)
     print("🚀 HYDROLUMINA API READY")
     print("="*60)
@@ -54,11 +103,23 @@ async def lifespan(app):
     print("\n🛑 HYDROLUMINA API SHUTTING DOWN...\n")
 
 
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (Rust) instead of stdlib json.
+    Serializes NumPy scalars/arrays natively via OPT_SERIALIZE_NUMPY.
+    (Defined here because FastAPI's own ORJSONResponse is deprecated.)
+    """
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
 app = FastAPI(
     title="HydroLumina API",
     description="Water Distribution Monitoring System - Backend Intelligence",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Configuration - Allow frontend access
@@ -81,29 +142,247 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 ENERGY_DATA_PATH = DATA_DIR / "energy_data.csv"
 USERS_DATA_PATH = DATA_DIR / "janaadhaar_users.json"
 SATELLITE_DATA_PATH = DATA_DIR / "satellite.json"
+MODEL_PATH = DATA_DIR / "iforest.joblib"  # Fitted IsolationForest, reused across restarts
+
+
+@lru_cache(maxsize=4)
+def _load_json(path_str: str, mtime: float):
+    """
+    Parse a JSON file with orjson. The mtime is part of the cache key,
+    so editing the file automatically invalidates the cached object.
+    """
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+def load_json(path: Path):
+    """
+    Return the parsed contents of a JSON data file (cached, shared - do not mutate).
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    return _load_json(str(path), path.stat().st_mtime)
+
+
+@lru_cache(maxsize=1)
+def _satellite_payload(mtime: float) -> tuple:
+    """
+    Serialized satellite.json bytes and their ETag, rebuilt when the mtime changes.
+    """
+    body = orjson.dumps(load_json(SATELLITE_DATA_PATH))
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (RFC 9110): the header is "*" or a comma-separated
+    list of entity tags, compared weakly (a W/ prefix on either side is ignored).
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+@lru_cache(maxsize=1)
+def _users_payload(mtime: float) -> bytes:
+    """
+    Serialized janaadhaar_users.json bytes for /users, rebuilt when the mtime changes.
+    """
+    return orjson.dumps(load_json(USERS_DATA_PATH))
 
 # =============================================================================
 # GLOBAL STATE & PRE-TRAINED MODEL
 # =============================================================================
 
-# Tank state (simulates real tank levels)
+@dataclass(frozen=True)
+class TankState:
+    """
+    Simulated tank (immutable). The physics functions take a state and
+    return the updated one instead of mutating shared module state.
+    """
+    level_m: float = 8.0       # Current water level in meters
+    max_level_m: float = 10.0  # Tank capacity
+    inflow_lps: float = 50.0   # Supply rate
+    outflow_lps: float = 45.0  # Consumption rate
+    
+    def for_mode(self, leak_mode: bool) -> "TankState":
+        """Same tank with the outflow for the mode (leak: more water leaving system)."""
+        return replace(self, outflow_lps=65.0 if leak_mode else 45.0)
+    
+    @property
+    def step_delta_m(self) -> float:
+        """Level change per simulation step."""
+        return (self.inflow_lps - self.outflow_lps) * 0.01
+
+
+# Current tank state (simulates real tank levels). Handlers compute a new
+# TankState purely and publish it with a single rebind - there is no await
+# in between, so concurrent requests on the event loop can't interleave.
 # NOTE: For production, this would be stored in Redis/TimescaleDB for multi-worker consistency
-tank_state = {
-    "level_m": 8.0,      # Current water level in meters
-    "max_level_m": 10.0, # Tank capacity
-    "inflow_lps": 50.0,  # Supply rate
-    "outflow_lps": 45.0  # Consumption rate
-}
+tank_state = TankState()
 
-# Pre-trained anomaly detection model (trained ONCE at module load, not per-request)
+# Shared PCG64 generator for the demo noise (one C call per batch of draws)
+_rng = np.random.default_rng()
+
+# Pre-trained anomaly detection model (trained ONCE at startup, not per-request)
 anomaly_model: Optional[IsolationForest] = None
 training_features = ['power_kw', 'voltage_v', 'current_a', 'power_factor']
+MODEL_PARAMS = {
+    "contamination": 0.05,  # Expect ~5% anomalies
+    "random_state": 42,
+    "n_estimators": 100,
+}
+
+# Columns of energy_data.csv the API actually uses (flow_actual_lps is skipped at parse time)
+# timestamp is pinned to string: "HH:MM" would otherwise be inferred as a time of day
+ENERGY_CSV_DTYPES = {
+    'timestamp': 'string',
+    'power_kw': np.float64,
+    'leak_spike_kw': np.float64,
+    'voltage_v': np.float64,
+    'current_a': np.float64,
+    'frequency_hz': np.float64,
+    'power_factor': np.float64,
+}
+ENERGY_CSV_COLUMNS = list(ENERGY_CSV_DTYPES)
+
+# IsolationForest scoring ignores the estimator's n_jobs; thread it across cores
+# only for batches big enough to amortize the dispatch (sklearn suggests ~1k+)
+PARALLEL_SCORING_MIN_SAMPLES = 1000
 
 # Leak location from satellite data (loaded at startup)
 leak_location = {"lat": 26.9144, "lon": 75.7833}  # Default from satellite.json
 
-# Network graph for pipe simulation (loaded on first request)
-network_graph = None
+# Parsed energy_data.csv and its contiguous feature matrix (reloaded only when the file changes)
+# Features are float32: the dtype IsolationForest trees compare in, so sklearn skips a cast+copy
+_energy_df_cache: Optional[pd.DataFrame] = None
+_energy_features: Optional[np.ndarray] = None
+_energy_mtime: Optional[float] = None
+
+# Pipe network for simulation as flat arrays (loaded on first request)
+network = None
+
+# Jan Aadhaar users cached as a DataFrame plus parallel coordinate arrays (reloaded when the file changes)
+# Coordinates are kept in radians, with cos(latitude) precomputed for the Haversine formula
+_users_df: Optional[pd.DataFrame] = None
+_user_lat_rads = np.empty(0)
+_user_lon_rads = np.empty(0)
+_user_cos_lats = np.empty(0)
+_users_mtime: Optional[float] = None
+
+# find_users_near_leak results keyed by (max_distance_km, limit); cleared when
+# the users file or the leak location changes
+_affected_cache = {"inputs": None, "results": {}}
+
+# Trig terms for the leak point, recomputed only when leak_location changes
+_leak_cache = {"lat": None, "lon": None, "lat_rad": None, "lon_rad": None, "cos_lat_rad": None}
+
+
+def read_energy_csv(path: Path, engine: str = CSV_ENGINE) -> pd.DataFrame:
+    """
+    Parse the used columns of an energy CSV with the pinned ENERGY_CSV_DTYPES.
+    
+    The pyarrow engine is driven through pyarrow.csv directly: pandas only
+    applies dtype= after pyarrow has inferred the columns, by which time
+    "23:50" has already become a time of day ("23:50:00"). Both engines
+    return the same frame.
+    """
+    if engine == "pyarrow":
+        column_types = {
+            name: pa.string() if dtype == 'string' else pa.from_numpy_dtype(np.dtype(dtype))
+            for name, dtype in ENERGY_CSV_DTYPES.items()
+        }
+        table = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=ENERGY_CSV_COLUMNS,
+                column_types=column_types
+            )
+        )
+        return table.to_pandas().astype(ENERGY_CSV_DTYPES)
+    
+    return pd.read_csv(path, usecols=ENERGY_CSV_COLUMNS, dtype=ENERGY_CSV_DTYPES, engine=engine)
+
+
+def load_energy_data() -> pd.DataFrame:
+    """
+    Load and cache energy_data.csv with precomputed anomaly columns.
+    The CSV is parsed once and re-read only when the file's mtime changes.
+    
+    Raises:
+        FileNotFoundError: If the energy data has not been generated yet
+    """
+    global _energy_df_cache, _energy_features, _energy_mtime
+    
+    mtime = ENERGY_DATA_PATH.stat().st_mtime
+    if _energy_df_cache is None or mtime != _energy_mtime:
+        df = read_energy_csv(ENERGY_DATA_PATH)
+        _energy_features = np.ascontiguousarray(df[training_features].to_numpy(dtype=np.float32))
+        _energy_df_cache = df
+        _energy_mtime = mtime
+        
+        # Model and data are both static, so anomaly columns are scored here once
+        # (at startup the model is fitted on this parse first - see initialize_model)
+        if anomaly_model is not None:
+            detect_anomalies(df, _energy_features)
+    
+    return _energy_df_cache
+
+
+def _model_fingerprint() -> str:
+    """
+    Key for what a fitted model depends on: MODEL_PARAMS, training_features
+    and the contents of energy_data.csv. A persisted model with another key is stale.
+    """
+    params = ",".join(f"{name}={value!r}" for name, value in sorted(MODEL_PARAMS.items()))
+    data_digest = hashlib.blake2b(ENERGY_DATA_PATH.read_bytes()).hexdigest()
+    return hashlib.blake2b(
+        f"{params}|{','.join(training_features)}|{data_digest}".encode()
+    ).hexdigest()[:16]
+
+
+def _load_or_fit_model(n_samples: int) -> IsolationForest:
+    """
+    Reuse the persisted model if it was fitted with the current settings on
+    the current energy_data.csv; otherwise train IsolationForest ONCE on the
+    cached features and persist it, so restarts (and extra workers) skip the
+    training pass.
+    
+    The fingerprint is stored inside the same joblib file as the model and the
+    file is renamed into place, so a crash or a concurrent worker can never
+    leave a model paired with the wrong fingerprint.
+    """
+    fingerprint = _model_fingerprint()
+    try:
+        saved = joblib.load(MODEL_PATH)
+        if isinstance(saved, dict) and saved.get("fingerprint") == fingerprint:
+            print(f"   ✅ Model loaded from {MODEL_PATH.name}")
+            return saved["model"]
+        print(f"   ♻️  {MODEL_PATH.name} is stale - retraining")
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # e.g. pickled with another scikit-learn version
+        print(f"   ⚠️  Could not load {MODEL_PATH.name} ({e}) - retraining")
+    
+    model = IsolationForest(**MODEL_PARAMS, n_jobs=-1)  # Use all CPU cores for training
+    # Fit on a plain ndarray: scoring then skips DataFrame conversion and feature-name checks
+    model.fit(_energy_features)
+    print(f"   ✅ Model trained on {n_samples} samples")
+    
+    # Per-process temp name, so concurrent workers never write the same file
+    tmp_path = MODEL_PATH.with_name(f"{MODEL_PATH.name}.{os.getpid()}.tmp")
+    try:
+        joblib.dump({"fingerprint": fingerprint, "model": model}, tmp_path, compress=3)
+        os.replace(tmp_path, MODEL_PATH)
+    except OSError as e:
+        print(f"   ⚠️  Could not save {MODEL_PATH.name}: {e}")
+    
+    return model
 
 
 def initialize_model():
@@ -116,30 +395,24 @@ def initialize_model():
     print("🧠 Initializing Anomaly Detection Model...")
     
     try:
-        # Load and train on startup data
-        df_train = pd.read_csv(ENERGY_DATA_PATH)
+        # Load and train on startup data (this parse is also the /analyze-energy cache)
+        df_train = load_energy_data()
         
-        # Train IsolationForest ONCE
-        anomaly_model = IsolationForest(
-            contamination=0.05,  # Expect ~5% anomalies
-            random_state=42,
-            n_estimators=100,
-            n_jobs=-1  # Use all CPU cores for training
-        )
-        anomaly_model.fit(df_train[training_features])
+        anomaly_model = _load_or_fit_model(len(df_train))
         
-        print(f"   ✅ Model trained on {len(df_train)} samples")
+        # Score the dataset ONCE so /analyze-energy never runs inference
+        detect_anomalies(df_train, _energy_features)
         
     except FileNotFoundError:
         print("   ⚠️  Energy data not found - model will train on first request")
         anomaly_model = None
     
     # Load leak location from satellite.json
+    # (parsed once via the shared JSON cache, which /satellite-zones then reuses)
     try:
-        with open(SATELLITE_DATA_PATH, 'r') as f:
-            satellite_data = json.load(f)
+        satellite_data = load_json(SATELLITE_DATA_PATH)
         
-        # Find the primary leak point (J5)
+        # Find the primary leak point (J5) - stop at the first Point feature
         for feature in satellite_data.get("features", []):
             if feature.get("geometry", {}).get("type") == "Point":
                 coords = feature["geometry"]["coordinates"]
@@ -151,29 +424,30 @@ def initialize_model():
         print("   ⚠️  Satellite data not found - using default leak location")
 
 
-# Initialize on module load
-initialize_model()
-
-
 # =============================================================================
 # PHYSICS SIMULATION
 # =============================================================================
 
-def calculate_water_flow(power_kw: float, leak_mode: bool = False) -> dict:
+# Fixed pump/hydraulics parameters. Numba freezes module globals into the
+# compiled kernels, so _RHO_G is folded into a single literal there.
+WATER_DENSITY = 1000.0  # ρ, kg/m³
+GRAVITY = 9.81          # g, m/s²
+STATIC_HEAD_M = 25.0    # meters (elevation difference)
+FLOW_DEMO_SCALE = 50.0  # physics gives micro-scale flow; scaled up for demo realism
+_RHO_G = WATER_DENSITY * GRAVITY
+
+@njit(cache=True, fastmath=True)
+def _flow_kernel(power_kw: float, tank_level: float, max_level: float,
+                 leak_mode: bool, noise: float) -> tuple:
     """
-    Smarter flow calculation with dynamic head physics.
+    Smarter flow calculation with dynamic head physics for one reading.
     
     NILM Energy Signature → Pump Efficiency → Flow Rate
     
-    Args:
-        power_kw: Current power consumption in kW
-        leak_mode: Whether to simulate leak conditions
-    
-    Returns:
-        Dictionary with flow_lpm, efficiency, and tank_level
+    Returns (flow_lpm, efficiency, head_m).
+    Pure function of its inputs - noise is drawn by the caller.
+    JIT-compiled with Numba when available.
     """
-    global tank_state
-    
     # Pump efficiency curve (power vs efficiency)
     # Real pumps have optimal operating points
     if power_kw < 30:
@@ -187,76 +461,159 @@ def calculate_water_flow(power_kw: float, leak_mode: bool = False) -> dict:
     
     # Head calculation (dynamic based on tank level)
     # H = (P * η) / (ρ * g * Q) → Q = (P * η) / (ρ * g * H)
-    static_head = 25.0  # meters (elevation difference)
-    tank_head = tank_state["max_level_m"] - tank_state["level_m"]  # Dynamic!
-    total_head = static_head + tank_head
+    tank_head = max_level - tank_level  # Dynamic!
+    total_head = STATIC_HEAD_M + tank_head
     
     # Simplified flow calculation (L/s)
     # Real: Q = (P * 1000 * η) / (ρ * g * H)
-    # Where ρ=1000 kg/m³, g=9.81 m/s²
-    flow_lps = (power_kw * 1000 * efficiency) / (1000 * 9.81 * total_head)
+    flow_lps = (power_kw * 1000 * efficiency) / (_RHO_G * total_head)
     
     # Scale up to realistic municipal pump levels
-    # (The physics gives micro-scale, we multiply for demo realism)
-    flow_lps *= 50  
+    flow_lps *= FLOW_DEMO_SCALE
     
-    # Add real-time noise (±5%) for dynamic feel
-    noise_factor = 1.0 + random.uniform(-0.05, 0.05)
-    flow_lps *= noise_factor
+    # Real-time noise (±5%) for dynamic feel
+    flow_lps *= noise
     
     # Leak mode: Increased consumption, reduced efficiency
     if leak_mode:
         efficiency *= 0.7  # Pump works harder
-        tank_state["outflow_lps"] = 65.0  # More water leaving system
         flow_lps *= 0.6  # Less reaches end users
-    else:
-        tank_state["outflow_lps"] = 45.0
     
-    # Update tank level (simulate over time)
-    delta = (tank_state["inflow_lps"] - tank_state["outflow_lps"]) * 0.01
-    tank_state["level_m"] = max(0.5, min(tank_state["max_level_m"], 
-                                          tank_state["level_m"] + delta))
+    # Convert to LPM for frontend
+    return int(flow_lps * 60), efficiency, total_head
+
+
+@njit(cache=True)
+def _tank_step(level: float, delta: float, max_level: float) -> float:
+    """
+    One tank simulation step: clamp to [0.5, max_level] plus the demo auto-reset.
+    """
+    level = max(0.5, min(max_level, level + delta))
+    if level < 2.0:
+        level = 8.0  # Reset to safe level for demo stability
+    return level
+
+
+@njit(cache=True, fastmath=True)
+def _flow_series_kernel(power_kw: np.ndarray, noise: np.ndarray, leak_mode: bool,
+                        level: float, max_level: float, delta: float) -> tuple:
+    """
+    Fused numeric core of calculate_water_flow_vec: runs _flow_kernel and a
+    tank step for each reading in one compiled loop (the tank level is a
+    serial dependency, which is cheap in compiled code).
+    
+    Returns:
+        (flow_lpm, efficiency, tank_level_m, head_m) arrays
+    """
+    n = power_kw.size
+    flow_lpm = np.empty(n, dtype=np.int32)
+    efficiency = np.empty(n)
+    levels = np.empty(n)
+    head = np.empty(n)
     
-    # AUTO-RESET: Prevent "Low Pressure" during demos - reset tank if too low
-    if tank_state["level_m"] < 2.0:
-        tank_state["level_m"] = 8.0  # Reset to safe level for demo stability
+    for i in range(n):
+        # Head for each reading uses the tank level *before* that reading's update
+        flow, eff, total_head = _flow_kernel(power_kw[i], level, max_level, leak_mode, noise[i])
+        flow_lpm[i] = flow
+        efficiency[i] = eff
+        head[i] = total_head
+        
+        level = _tank_step(level, delta, max_level)
+        levels[i] = level
     
-    # Convert to LPM for frontend
-    flow_lpm = int(flow_lps * 60)
+    return flow_lpm, efficiency, levels, head
+
+
+def _round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round an array exactly like Python's round(), via a lookup over its distinct values.
+    
+    np.round scales before rounding half-to-even, so e.g. 0.55 * 0.7 becomes
+    0.38 where round() gives 0.39. Efficiency, tank level and head only take a
+    handful of distinct values, so rounding those with round() is cheap.
+    """
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([round(value, ndigits) for value in unique.tolist()])[inverse]
+
+
+def calculate_water_flow_vec(power_kw: np.ndarray, state: TankState, leak_mode: bool = False,
+                             noise: Optional[np.ndarray] = None) -> tuple:
+    """
+    Water flow for a whole array of power readings.
+    
+    Runs _flow_kernel (efficiency curve, dynamic head, noise) and the
+    sequential tank update in one pass through _flow_series_kernel
+    (compiled when Numba is available).
+    
+    Args:
+        power_kw: Array of power consumption readings in kW
+        state: Tank state before the first reading
+        leak_mode: Whether to simulate leak conditions
+        noise: Optional pre-drawn flow noise factors (default: ±5% uniform)
+    
+    Returns:
+        (dict of arrays flow_lpm, efficiency, tank_level_m and head_m,
+         TankState after the last reading)
+    """
+    power_kw = np.asarray(power_kw, dtype=np.float64)
+    n = power_kw.size
+    if noise is None:
+        noise = _rng.uniform(0.95, 1.05, size=n)
+    
+    state = state.for_mode(leak_mode)
+    flow_lpm, efficiency, levels, head = _flow_series_kernel(
+        power_kw, np.asarray(noise, dtype=np.float64), leak_mode,
+        state.level_m, state.max_level_m, state.step_delta_m
+    )
+    if n:
+        state = replace(state, level_m=float(levels[-1]))
     
     return {
         "flow_lpm": flow_lpm,
-        "efficiency": round(efficiency, 2),
-        "tank_level_m": round(tank_state["level_m"], 2),
-        "head_m": round(total_head, 1)
-    }
+        "efficiency": _round_like_python(efficiency, 2),
+        "tank_level_m": _round_like_python(levels, 2),
+        "head_m": _round_like_python(head, 1)
+    }, state
 
 
 # =============================================================================
 # ANOMALY DETECTION (Prediction Only - Model Pre-Trained)
 # =============================================================================
 
-def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
+def detect_anomalies(df: pd.DataFrame, features: Optional[np.ndarray] = None) -> pd.DataFrame:
     """
     Use pre-trained IsolationForest to PREDICT anomalies.
     
     IMPORTANT: Model is trained at startup, not here!
-    This function only calls .predict() for fast inference.
+    Called once when the energy data is loaded (see load_energy_data), so
+    the request path only reads the precomputed columns.
+    
+    Adds is_anomaly/anomaly_score columns for the readings.
+    
+    Args:
+        df: Energy readings; anomaly columns are added in place
+        features: Optional precomputed training_features matrix for df
     """
     global anomaly_model
     
-    features = df[training_features].copy()
+    if features is None:
+        features = df[training_features].to_numpy(dtype=np.float32)
     
     if anomaly_model is None:
         # Fallback: train if not initialized (shouldn't happen in production)
         print("⚠️  Model not initialized - training now (fallback)")
-        anomaly_model = IsolationForest(contamination=0.05, random_state=42)
+        anomaly_model = IsolationForest(**MODEL_PARAMS, n_jobs=-1)
         anomaly_model.fit(features)
     
-    # PREDICT only - no training here!
-    predictions = anomaly_model.predict(features)
-    df['is_anomaly'] = predictions == -1
-    df['anomaly_score'] = anomaly_model.decision_function(features)
+    n_jobs = -1 if len(features) >= PARALLEL_SCORING_MIN_SAMPLES else 1
+    with parallel_backend("threading", n_jobs=n_jobs):
+        # PREDICT only - no training here!
+        # decision_function is centred on offset_, so predict() == -1 is exactly
+        # score < 0; deriving it saves a second walk over every tree
+        # Scores are stored at display precision (flags use the exact values)
+        scores = anomaly_model.decision_function(features)
+        df['anomaly_score'] = np.round(scores, 3)
+        df['is_anomaly'] = scores < 0
     
     return df
 
@@ -264,79 +621,303 @@ def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
 # PIPE NETWORK UTILITIES
 # =============================================================================
 
-def get_network_graph():
+_GRAPHML_NS = "{http://graphml.graphdrawing.org/xmlns}"
+
+# GraphML attr.type -> Python converter
+_GRAPHML_TYPES = {
+    "boolean": lambda value: value.strip().lower() in ("true", "1"),
+    "int": int,
+    "long": int,
+    "float": float,
+    "double": float,
+    "string": str,
+}
+
+
+@dataclass
+class NetworkSoA:
+    """
+    Pipe network as flat, index-addressed arrays (structure of arrays).
+    Only nodes with coordinates, and pipes between them, are kept.
+    Styling and leak-mode physics that never change are derived once in
+    __post_init__ so /pipe-network only does per-request array math.
+    """
+    node_id: list = field(default_factory=list)
+    node_type: list = field(default_factory=list)
+    name: list = field(default_factory=list)
+    lon: np.ndarray = field(default_factory=lambda: np.empty(0))
+    lat: np.ndarray = field(default_factory=lambda: np.empty(0))
+    elev: np.ndarray = field(default_factory=lambda: np.empty(0))
+    demand: np.ndarray = field(default_factory=lambda: np.empty(0))
+    u_idx: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.intp))
+    v_idx: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.intp))
+    pipe_id: list = field(default_factory=list)
+    diameter: np.ndarray = field(default_factory=lambda: np.empty(0))
+    length: np.ndarray = field(default_factory=lambda: np.empty(0))
+    
+    def __post_init__(self):
+        # Node styling for both display modes: (icon, color, size, is_leak)
+        self.node_style = [_node_style(node_type, False) for node_type in self.node_type]
+        self.node_style_leak = [
+            _node_style(node_type, 'J5' in node_id)
+            for node_id, node_type in zip(self.node_id, self.node_type)
+        ]
+        
+        # Pipe category for styling depends only on diameter, so bin it once here
+        class_conds = [self.diameter >= 400, self.diameter >= 200]
+        self.pipe_class = np.select(class_conds, ["MAIN", "SECONDARY"], "DISTRIBUTION").tolist()
+        self.base_weight = np.select(class_conds, [6, 4], 2).astype(np.int8)
+        self.class_color = np.select(class_conds, ["#00f2ff", "#00d4aa"], "#00b8d4")
+        
+        # Leak simulation: pipes touching J5 break, the rest lose pressure by size
+        # (smaller pipes affected more), so the leak-mode loss is fixed per pipe
+        is_j5 = np.array(['J5' in node_id for node_id in self.node_id], dtype=bool)
+        self.touches_leak = is_j5[self.u_idx] | is_j5[self.v_idx]
+        self.leak_pressure_loss = np.where(self.touches_leak, 0.8, 0.15 + (0.1 * (1 - self.diameter / 500)))
+    
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_id)
+    
+    @property
+    def num_pipes(self) -> int:
+        return len(self.pipe_id)
+
+
+def load_network_soa(path: Path) -> NetworkSoA:
     """
-    Load and cache the network graph from GraphML file.
-    Returns empty graph if file not found.
+    Stream a GraphML file into a NetworkSoA.
+    
+    Uses iterparse and clears each <node>/<edge> once read, so no graph
+    object or per-element attribute dicts outlive the parse.
     """
-    global network_graph
+    keys = {}      # key id -> (attr name, converter)
+    defaults = {}  # "node"/"edge" -> {attr name: default value}
+    nodes = {}     # node id -> attrs, in file order
+    edges = {}     # undirected (u, v) -> (u, v, attrs), in file order
     
-    if network_graph is None:
+    for _, elem in ET.iterparse(path, events=("end",)):
+        tag = elem.tag.replace(_GRAPHML_NS, "")
+        
+        if tag == "key":
+            convert = _GRAPHML_TYPES.get(elem.get("attr.type", "string"), str)
+            keys[elem.get("id")] = (elem.get("attr.name"), convert)
+            default = elem.find(f"{_GRAPHML_NS}default")
+            if default is not None and default.text is not None:
+                defaults.setdefault(elem.get("for"), {})[elem.get("attr.name")] = convert(default.text)
+        
+        elif tag in ("node", "edge"):
+            attrs = dict(defaults.get(tag, {}))
+            for data in elem.iter(f"{_GRAPHML_NS}data"):
+                name, convert = keys[data.get("key")]
+                attrs[name] = convert(data.text or "")
+            
+            if tag == "node":
+                nodes[elem.get("id")] = attrs
+            else:
+                u, v = elem.get("source"), elem.get("target")
+                edge_key = (u, v) if u <= v else (v, u)
+                if edge_key in edges:
+                    edges[edge_key][2].update(attrs)  # Undirected: repeated pipe updates in place
+                else:
+                    edges[edge_key] = (u, v, attrs)
+            elem.clear()
+    
+    # Keep only nodes with coordinates, and pipes whose ends are both kept
+    node_items = [
+        (node_id, attrs) for node_id, attrs in nodes.items()
+        if 'latitude' in attrs and 'longitude' in attrs
+    ]
+    node_idx = {node_id: i for i, (node_id, _) in enumerate(node_items)}
+    edge_items = [
+        (u, v, attrs) for u, v, attrs in edges.values()
+        if u in node_idx and v in node_idx
+    ]
+    
+    return NetworkSoA(
+        node_id=[node_id for node_id, _ in node_items],
+        node_type=[attrs.get('node_type', 'junction') for _, attrs in node_items],
+        name=[attrs.get('name', node_id) for node_id, attrs in node_items],
+        lon=np.array([attrs['longitude'] for _, attrs in node_items], dtype=np.float64),
+        lat=np.array([attrs['latitude'] for _, attrs in node_items], dtype=np.float64),
+        elev=np.array([attrs.get('elevation', 0) for _, attrs in node_items], dtype=np.float64),
+        demand=np.array([attrs.get('demand', 0) for _, attrs in node_items], dtype=np.float64),
+        u_idx=np.array([node_idx[u] for u, _, _ in edge_items], dtype=np.intp),
+        v_idx=np.array([node_idx[v] for _, v, _ in edge_items], dtype=np.intp),
+        pipe_id=[attrs.get('pipe_id', f"{u}-{v}") for u, v, attrs in edge_items],
+        diameter=np.array([attrs.get('diameter', 100) for _, _, attrs in edge_items], dtype=np.float64),
+        length=np.array([attrs.get('length', 0) for _, _, attrs in edge_items], dtype=np.float64),
+    )
+
+
+def get_network() -> NetworkSoA:
+    """
+    Load and cache the pipe network from the GraphML file.
+    Returns an empty network if the file is not found.
+    """
+    global network
+    
+    if network is None:
         try:
-            network_graph = nx.read_graphml(DATA_DIR / "network.graphml")
-            print(f"   🔧 Network graph loaded: {network_graph.number_of_nodes()} nodes, {network_graph.number_of_edges()} pipes")
+            network = load_network_soa(DATA_DIR / "network.graphml")
+            print(f"   🔧 Network loaded: {network.num_nodes} nodes, {network.num_pipes} pipes")
         except FileNotFoundError:
             print("   ⚠️  network.graphml not found - pipe simulation disabled")
-            network_graph = nx.Graph()  # Empty fallback
+            network = NetworkSoA()  # Empty fallback
         except Exception as e:
             print(f"   ⚠️  Error loading network: {e}")
-            network_graph = nx.Graph()
+            network = NetworkSoA()
     
-    return network_graph
+    return network
+
+
+def _node_style(node_type: str, is_leak_node: bool) -> tuple:
+    """
+    Map-marker styling for a network node: (icon, color, size, is_leak).
+    """
+    # Determine node styling based on type
+    if node_type == 'reservoir':
+        return "💧", "#3b82f6", 16, is_leak_node  # Blue
+    if node_type == 'pump':
+        return "⚡", "#f59e0b", 14, is_leak_node  # Amber
+    if node_type == 'tank':
+        return "🏛️", "#8b5cf6", 14, is_leak_node  # Purple
+    # junction
+    if is_leak_node:
+        return "⊕", "#ff2a2a", 10, True
+    return "○", "#00f2ff", 8, False
 
 
 # =============================================================================
 # GIS UTILITIES
 # =============================================================================
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+EARTH_RADIUS_KM = 6371.0
+
+
+@vectorize(["float64(float64, float64, float64, float64, float64, float64)"], cache=True, fastmath=True)
+def _haversine_kernel(lat1_rad, lon1_rad, cos_lat1, lat2_rad, lon2_rad, cos_lat2):
+    """
+    Haversine kernel behind haversine_distance (in km).
+    
+    Takes latitudes/longitudes in radians plus cos(latitude) for each point,
+    so callers can precompute the trig terms of points that don't move.
+    Compiled to a NumPy ufunc with Numba when available, so it takes
+    scalars or arrays (broadcast) either way.
+    """
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = lon2_rad - lon1_rad
+    
+    a = (np.sin(delta_lat / 2) ** 2 +
+         cos_lat1 * cos_lat2 * np.sin(delta_lon / 2) ** 2)
+    # asin form needs one sqrt (vs two for atan2); clamp guards antipodal rounding
+    c = 2 * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+    
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
     """
     Calculate the great-circle distance between two points on Earth (in km).
     Uses the Haversine formula for accuracy.
+    
+    Takes latitudes/longitudes in degrees, as scalars or arrays (broadcast).
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    return _haversine_kernel(
+        lat1_rad, np.radians(lon1), np.cos(lat1_rad),
+        lat2_rad, np.radians(lon2), np.cos(lat2_rad)
+    )
+
+
+def _haversine_from_leak(lat2_rad: np.ndarray, lon2_rad: np.ndarray, cos_lat2: np.ndarray) -> np.ndarray:
+    """
+    Haversine distances (in km) from the leak point to many points.
+    
+    The leak point's trig terms are cached in _leak_cache and recomputed
+    only when leak_location changes.
+    """
+    if _leak_cache["lat"] != leak_location["lat"] or _leak_cache["lon"] != leak_location["lon"]:
+        lat_rad = math.radians(leak_location["lat"])
+        _leak_cache.update(
+            lat=leak_location["lat"],
+            lon=leak_location["lon"],
+            lat_rad=lat_rad,
+            lon_rad=math.radians(leak_location["lon"]),
+            cos_lat_rad=math.cos(lat_rad)
+        )
+    
+    return _haversine_kernel(
+        _leak_cache["lat_rad"], _leak_cache["lon_rad"], _leak_cache["cos_lat_rad"],
+        lat2_rad, lon2_rad, cos_lat2
+    )
+
+
+def load_users() -> pd.DataFrame:
     """
-    R = 6371  # Earth's radius in kilometers
+    Load and cache janaadhaar_users.json as a DataFrame (struct-of-arrays),
+    along with the coordinate arrays used for the Haversine search.
+    The cache is rebuilt only when the file's mtime changes.
     
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
+    Raises:
+        FileNotFoundError: If the users file has not been generated yet
+    """
+    global _users_df, _user_lat_rads, _user_lon_rads, _user_cos_lats, _users_mtime
     
-    a = (math.sin(delta_lat / 2) ** 2 + 
-         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    mtime = USERS_DATA_PATH.stat().st_mtime
+    if _users_df is None or mtime != _users_mtime:
+        _users_df = pd.DataFrame(load_json(USERS_DATA_PATH))
+        _users_df["name_upper"] = _users_df["name"].str.upper()  # HUD display form, built once
+        _user_lat_rads = np.radians(_users_df["lat"].to_numpy(dtype=np.float64))
+        _user_lon_rads = np.radians(_users_df["lon"].to_numpy(dtype=np.float64))
+        _user_cos_lats = np.cos(_user_lat_rads)
+        _users_mtime = mtime
     
-    return R * c
+    return _users_df
 
 
-def find_users_near_leak(users: list, max_distance_km: float = 0.5) -> list:
+def find_users_near_leak(max_distance_km: float = 0.5, limit: Optional[int] = None) -> list:
     """
     Find users within a specified distance from the leak location.
     Uses actual GIS coordinates from satellite.json and janaadhaar_users.json.
     
+    Distances to every user are computed in one vectorized pass over the
+    cached lat/lon arrays; dicts are only built for the returned subset.
+    
     Args:
-        users: List of user dictionaries with 'lat' and 'lon' fields
         max_distance_km: Maximum distance from leak to consider affected
+        limit: Optional cap on the number of users returned (closest first)
     
     Returns:
         List of users sorted by distance to leak (closest first)
     """
-    users_with_distance = []
+    users_df = load_users()
     
-    for user in users:
-        distance = haversine_distance(
-            leak_location["lat"], leak_location["lon"],
-            user["lat"], user["lon"]
-        )
-        users_with_distance.append({
-            **user,
-            "distance_to_leak_km": round(distance, 3)
-        })
+    # Result depends only on the users file, the leak point and the arguments
+    inputs = (_users_mtime, leak_location["lat"], leak_location["lon"])
+    if _affected_cache["inputs"] != inputs:
+        _affected_cache["inputs"] = inputs
+        _affected_cache["results"] = {}
+    cached = _affected_cache["results"].get((max_distance_km, limit))
+    if cached is not None:
+        return [dict(user) for user in cached]
     
-    # Sort by distance and filter
-    users_with_distance.sort(key=lambda u: u["distance_to_leak_km"])
-    affected = [u for u in users_with_distance if u["distance_to_leak_km"] <= max_distance_km]
+    distances = _haversine_from_leak(_user_lat_rads, _user_lon_rads, _user_cos_lats)
     
-    return affected if affected else [users_with_distance[0]]  # At least return closest
+    idx = np.flatnonzero(distances <= max_distance_km)
+    if idx.size == 0:
+        idx = np.array([np.argmin(distances)])  # At least return closest
+    
+    # Partial selection of the closest-k, then sort only that subset
+    if limit is not None and limit < idx.size:
+        idx = idx[np.argpartition(distances[idx], limit - 1)[:limit]]
+    idx = idx[np.argsort(distances[idx])]
+    
+    affected = users_df.iloc[idx].assign(distance_to_leak_km=np.round(distances[idx], 3))
+    records = affected.to_dict(orient="records")
+    _affected_cache["results"][(max_distance_km, limit)] = records
+    return [dict(user) for user in records]
 
 
 # =============================================================================
@@ -371,17 +952,17 @@ BSR_CATALOG = {
 }
 
 
-def estimate_repair_cost(leak_severity: str = "medium") -> dict:
+BSR_SEVERITY_MAP = {
+    "small": "pipe_repair_small",
+    "medium": "pipe_repair_medium", 
+    "large": "pipe_repair_large"
+}
+
+
+def _compute_repair_cost(item_key: str) -> dict:
     """
-    Estimate repair cost based on BSR (Basic Schedule of Rates).
+    Compute the BSR (Basic Schedule of Rates) estimate for one catalog item.
     """
-    severity_map = {
-        "small": "pipe_repair_small",
-        "medium": "pipe_repair_medium", 
-        "large": "pipe_repair_large"
-    }
-    
-    item_key = severity_map.get(leak_severity, "pipe_repair_medium")
     item = BSR_CATALOG[item_key]
     
     # Calculate with Rajasthan labor rates (approx ₹450/hour)
@@ -401,93 +982,189 @@ def estimate_repair_cost(leak_severity: str = "medium") -> dict:
     }
 
 
+# BSR_CATALOG is static, so every severity's estimate is computed once at import
+_BSR_ESTIMATES = {
+    severity: _compute_repair_cost(item_key)
+    for severity, item_key in BSR_SEVERITY_MAP.items()
+}
+
+# Pre-serialized /bsr-estimate responses
+_BSR_CACHE = {
+    severity: orjson.dumps(estimate)
+    for severity, estimate in _BSR_ESTIMATES.items()
+}
+
+# Read-only views shared across requests (the breakdown is frozen too)
+_BSR_PRECOMPUTED = MappingProxyType({
+    severity: MappingProxyType({**estimate, "breakdown": MappingProxyType(estimate["breakdown"])})
+    for severity, estimate in _BSR_ESTIMATES.items()
+})
+
+
+def estimate_repair_cost(leak_severity: str = "medium") -> Mapping:
+    """
+    Estimate repair cost based on BSR (Basic Schedule of Rates).
+    Returns the precomputed, read-only estimate; unknown severities
+    fall back to medium.
+    """
+    return _BSR_PRECOMPUTED.get(leak_severity, _BSR_PRECOMPUTED["medium"])
+
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
 
-@app.get("/")
-async def root():
-    """API root - returns service info."""
-    return {
+@lru_cache(maxsize=8)
+def _root_payload(model_loaded: bool, leak_lat: float, leak_lon: float) -> bytes:
+    """
+    Serialized / response; it only changes with model availability or the leak point.
+    """
+    return orjson.dumps({
         "service": "HydroLumina API",
         "version": "1.0.0",
         "status": "operational",
-        "model_loaded": anomaly_model is not None,
-        "leak_location": leak_location,
+        "model_loaded": model_loaded,
+        "leak_location": {"lon": leak_lon, "lat": leak_lat},
         "endpoints": ["/analyze-energy", "/health", "/bsr-estimate", "/affected-user"]
-    }
+    })
+
+
+@app.get("/")
+async def root():
+    """API root - returns service info."""
+    body = _root_payload(anomaly_model is not None, leak_location["lat"], leak_location["lon"])
+    return Response(content=body, media_type="application/json")
+
+
+# /health body split around its only per-request value (tank level)
+_HEALTH_SUFFIX = b',"production_note":"Tank state uses in-memory storage. For multi-worker production, use Redis/TimescaleDB."}'
+
+
+@lru_cache(maxsize=4)
+def _health_prefix(data_available: bool, model_loaded: bool) -> bytes:
+    """
+    Serialized /health fields up to (and including) the tank_level_m key.
+    """
+    head = orjson.dumps({
+        "status": "healthy" if data_available and model_loaded else "degraded",
+        "data_available": data_available,
+        "model_loaded": model_loaded,
+    })
+    return head[:-1] + b',"tank_level_m":'
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
     data_available = ENERGY_DATA_PATH.exists()
-    return {
-        "status": "healthy" if data_available and anomaly_model else "degraded",
-        "data_available": data_available,
-        "model_loaded": anomaly_model is not None,
-        "tank_level_m": tank_state["level_m"],
-        "production_note": "Tank state uses in-memory storage. For multi-worker production, use Redis/TimescaleDB."
-    }
+    body = (
+        _health_prefix(data_available, anomaly_model is not None)
+        + orjson.dumps(tank_state.level_m)
+        + _HEALTH_SUFFIX
+    )
+    return Response(content=body, media_type="application/json")
+
+
+# Rows per serialized chunk when /analyze-energy streams its response
+STREAM_CHUNK_ROWS = 256
 
 
 @app.get("/analyze-energy")
 async def analyze_energy(
     simulate_leak: bool = Query(default=False, description="Toggle leak simulation mode"),
-    limit: Optional[int] = Query(default=None, description="Limit number of records")
+    limit: Optional[int] = Query(default=None, description="Limit number of records"),
+    fmt: Literal["json", "ndjson", "columns"] = Query(
+        default="json", alias="format", description="Response format: json, ndjson (streamed) or columns"
+    )
 ):
     """
     Main analysis endpoint - returns energy data with calculated water flow.
     
     Technical Note:
-        The anomaly detection model is pre-trained at startup.
-        This endpoint only calls .predict() for fast inference.
+        The anomaly detection model is pre-trained at startup, and its
+        predictions are precomputed when the energy data is loaded.
+        This endpoint only reads the cached anomaly columns.
     
     Args:
         simulate_leak: If True, uses leak_spike_kw instead of power_kw
         limit: Optional limit on number of records returned
+        fmt: Response format (?format=) - "ndjson" streams one JSON object per line
+            instead of a JSON array; "columns" returns one array per field
+            ({"timestamp": [...], ...}); anything else is rejected with a 422
     
     Returns:
         List of energy readings with calculated flow rates
     """
+    global tank_state
+    
     try:
-        # Load energy data
-        df = pd.read_csv(ENERGY_DATA_PATH)
+        # Energy data is cached in memory with anomaly columns precomputed at load
+        df = load_energy_data()
+        if 'is_anomaly' not in df.columns:
+            # Data generated after startup: score it now (trains the fallback model if needed)
+            detect_anomalies(df, _energy_features)
         
         # Use appropriate power column based on mode
         power_column = 'leak_spike_kw' if simulate_leak else 'power_kw'
         
-        # Detect anomalies (uses pre-trained model - PREDICT only, no training!)
-        df = detect_anomalies(df)
+        # Calculate flow for all readings in one vectorized pass
+        # Real-time noise is drawn up front in one batch per quantity:
+        # ±3% on power readings and ±5% on the derived flow
+        n = len(df)
+        noise_power = _rng.uniform(0.97, 1.03, size=n)
+        noise_flow = _rng.uniform(0.95, 1.05, size=n)
         
-        # Calculate flow for each reading
-        results = []
+        power = df[power_column].to_numpy(dtype=np.float64)
+        power_with_noise = power * noise_power
+        flow_data, tank_state = calculate_water_flow_vec(
+            power_with_noise, tank_state, leak_mode=simulate_leak, noise=noise_flow
+        )
         
-        for _, row in df.iterrows():
-            power = row[power_column]
-            # Add ±3% real-time noise to power readings for dynamic feel
-            power_with_noise = power * (1.0 + random.uniform(-0.03, 0.03))
-            flow_data = calculate_water_flow(power_with_noise, leak_mode=simulate_leak)
-            
-            results.append({
-                "timestamp": row['timestamp'],
-                "power_kw": round(power_with_noise, 1),
-                "voltage_v": row['voltage_v'],
-                "current_a": row['current_a'],
-                "frequency_hz": row['frequency_hz'],
-                "power_factor": row['power_factor'],
-                "flow_lpm": flow_data['flow_lpm'],
-                "efficiency": flow_data['efficiency'],
-                "tank_level_m": flow_data['tank_level_m'],
-                "is_anomaly": bool(row['is_anomaly']),
-                "anomaly_score": round(row['anomaly_score'], 3)
-            })
+        # Build the response frame from just the output columns (no copy of the cached frame)
+        response_df = pd.DataFrame({
+            "timestamp": df['timestamp'],
+            "power_kw": np.round(power_with_noise, 1),
+            "voltage_v": df['voltage_v'],
+            "current_a": df['current_a'],
+            "frequency_hz": df['frequency_hz'],
+            "power_factor": df['power_factor'],
+            "flow_lpm": flow_data['flow_lpm'],
+            "efficiency": flow_data['efficiency'],
+            "tank_level_m": flow_data['tank_level_m'],
+            "is_anomaly": df['is_anomaly'],
+            "anomaly_score": df['anomaly_score']
+        })
         
-        # Apply limit if specified
+        # Apply limit if specified (before to_dict, so only returned rows become dicts)
         if limit:
-            results = results[-limit:]
+            response_df = response_df.tail(limit)
+        
+        if fmt == "columns":
+            # Struct-of-arrays: numeric columns go to orjson as NumPy arrays,
+            # with no per-row dicts and no repeated keys in the payload
+            return ORJSONResponse({
+                name: column.to_numpy() if column.dtype.kind in "biuf" else column.tolist()
+                for name, column in response_df.items()
+            })
+        
+        if fmt == "ndjson":
+            # Serialize in row chunks so the client starts receiving data before the
+            # whole payload exists, and only one chunk's bytes are held at a time
+            def ndjson_chunks():
+                for start in range(0, len(response_df), STREAM_CHUNK_ROWS):
+                    records = response_df.iloc[start:start + STREAM_CHUNK_ROWS].to_dict(orient="records")
+                    yield b"".join(orjson.dumps(record) + b"\n" for record in records)
+            
+            # The body is produced after this handler returns, outside the try below;
+            # build the first chunk now so serialization errors still surface here
+            chunks = ndjson_chunks()
+            first = next(chunks, b"")
+            return StreamingResponse(
+                itertools.chain((first,), chunks), media_type="application/x-ndjson"
+            )
         
-        return results
+        # Return the response directly so FastAPI skips its jsonable_encoder walk
+        return ORJSONResponse(response_df.to_dict(orient="records"))
         
     except FileNotFoundError:
         return {"error": "Energy data not found. Please run data_factory.py first."}
@@ -510,12 +1187,8 @@ async def get_affected_user(
         Jan Aadhaar data for the user closest to the leak, with BSR cost estimate.
     """
     try:
-        # Load user data
-        with open(USERS_DATA_PATH, 'r') as f:
-            users = json.load(f)
-        
         # Find users near the leak using GIS distance calculation
-        affected_users = find_users_near_leak(users, max_distance_km=0.5)
+        affected_users = find_users_near_leak(max_distance_km=0.5, limit=1)
         
         # Get the closest affected user
         affected_user = affected_users[0]
@@ -525,7 +1198,7 @@ async def get_affected_user(
         
         return {
             "id": affected_user["id"],
-            "name": affected_user["name"].upper(),
+            "name": affected_user["name_upper"],
             "location": zone,
             "locality": affected_user["locality"],
             "coordinates": {
@@ -557,8 +1230,12 @@ async def bsr_estimate(
 ):
     """
     Get BSR cost estimate for a repair job.
+    Served from pre-serialized bytes; unknown severities fall back to medium.
     """
-    return estimate_repair_cost(severity)
+    return Response(
+        content=_BSR_CACHE.get(severity, _BSR_CACHE["medium"]),
+        media_type="application/json"
+    )
 
 
 @app.get("/users")
@@ -568,25 +1245,30 @@ async def get_all_users():
     Used by the React MapView component.
     """
     try:
-        with open(USERS_DATA_PATH, 'r') as f:
-            users = json.load(f)
-        return users
+        body = _users_payload(USERS_DATA_PATH.stat().st_mtime)
+        return Response(content=body, media_type="application/json")
     except FileNotFoundError:
         return {"error": "User data not found. Please run data_factory.py first."}
 
 
 @app.get("/satellite-zones")
-async def get_satellite_zones():
+async def get_satellite_zones(request: Request):
     """
     Return satellite anomaly zones (GeoJSON) for map display.
     Used by the React MapView component in leak mode.
+    
+    The GeoJSON is served as pre-serialized bytes with an ETag, so repeat
+    polls with If-None-Match get an empty 304.
     """
     try:
-        with open(SATELLITE_DATA_PATH, 'r') as f:
-            satellite_data = json.load(f)
-        return satellite_data
+        body, etag = _satellite_payload(SATELLITE_DATA_PATH.stat().st_mtime)
     except FileNotFoundError:
         return {"error": "Satellite data not found."}
+    
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/pipe-network")
@@ -602,10 +1284,10 @@ async def get_pipe_network(leak_mode: bool = Query(default=False)):
     Returns:
         GeoJSON FeatureCollection with pipe LineStrings and infrastructure nodes
     """
-    G = get_network_graph()
+    net = get_network()
     
-    # Handle empty graph (file not found)
-    if G.number_of_nodes() == 0:
+    # Handle empty network (file not found)
+    if net.num_nodes == 0:
         return {
             "type": "FeatureCollection",
             "features": [],
@@ -615,147 +1297,105 @@ async def get_pipe_network(leak_mode: bool = Query(default=False)):
     
     # Get current "Virtual Flow" from our Energy-Water Proxy
     current_power = 75.0 if leak_mode else 45.0
-    flow_data = calculate_water_flow(current_power, leak_mode)
-    base_flow = flow_data['flow_lpm']
-    
-    pipe_features = []
-    node_features = []
+    # Pure evaluation at the current tank level: a map refresh must not step
+    # the tank simulation or add noise to the reported base flow
+    base_flow, efficiency, _ = _flow_kernel(
+        current_power, tank_state.level_m, tank_state.max_level_m, leak_mode, 1.0
+    )
     
     # =========================================================================
     # NODE EXTRACTION - Infrastructure Points (Reservoir, Pump, Tank, Junction)
     # =========================================================================
-    for node_id, node_data in G.nodes(data=True):
-        if 'latitude' not in node_data or 'longitude' not in node_data:
-            continue
-            
-        node_type = node_data.get('node_type', 'junction')
-        is_leak_node = leak_mode and 'J5' in str(node_id)
-        
-        # Determine node styling based on type
-        if node_type == 'reservoir':
-            icon = "💧"
-            color = "#3b82f6"  # Blue
-            size = 16
-        elif node_type == 'pump':
-            icon = "⚡"
-            color = "#f59e0b"  # Amber
-            size = 14
-        elif node_type == 'tank':
-            icon = "🏛️"
-            color = "#8b5cf6"  # Purple
-            size = 14
-        else:  # junction
-            icon = "⊕" if is_leak_node else "○"
-            color = "#ff2a2a" if is_leak_node else "#00f2ff"
-            size = 10 if is_leak_node else 8
-        
-        node_features.append({
+    node_ids = net.node_id
+    
+    # Styling depends only on node type and leak_mode, so it is resolved at load (NetworkSoA)
+    node_features = [
+        {
             "type": "Feature",
             "geometry": {
                 "type": "Point",
-                "coordinates": [
-                    float(node_data.get('longitude', 0)),
-                    float(node_data.get('latitude', 0))
-                ]
+                "coordinates": [lon, lat]
             },
             "properties": {
-                "node_id": str(node_id),
+                "node_id": node_id,
                 "node_type": node_type,
-                "name": node_data.get('name', str(node_id)),
-                "elevation": float(node_data.get('elevation', 0)),
+                "name": name,
+                "elevation": elevation,
                 "icon": icon,
                 "color": color,
                 "size": size,
                 "is_leak": is_leak_node,
-                "demand_lps": float(node_data.get('demand', 0))
+                "demand_lps": demand
             }
-        })
+        }
+        for node_id, node_type, name, lon, lat, elevation, demand, (icon, color, size, is_leak_node) in zip(
+            node_ids, net.node_type, net.name,
+            net.lon.tolist(), net.lat.tolist(),
+            net.elev.tolist(), net.demand.tolist(),
+            net.node_style_leak if leak_mode else net.node_style
+        )
+    ]
     
     # =========================================================================
     # PIPE EXTRACTION - With Enhanced Physics Simulation
     # =========================================================================
-    for u, v, data in G.edges(data=True):
-        node_u = G.nodes[u]
-        node_v = G.nodes[v]
-        
-        if 'latitude' not in node_u or 'longitude' not in node_u:
-            continue
-        if 'latitude' not in node_v or 'longitude' not in node_v:
-            continue
-        
-        # Get pipe properties
-        diameter = float(data.get('diameter', 100))
-        length = float(data.get('length', 0))
-        
-        # Calculate physics-based properties
-        pressure_loss = 0.0
-        status = "NORMAL"
-        flow_velocity = 1.0  # m/s base velocity
-        
-        # Determine pipe category for styling
-        if diameter >= 400:
-            pipe_class = "MAIN"
-            base_weight = 6
-        elif diameter >= 200:
-            pipe_class = "SECONDARY"
-            base_weight = 4
-        else:
-            pipe_class = "DISTRIBUTION"
-            base_weight = 2
-        
-        # Leak simulation physics
-        if leak_mode and ('J5' in str(u) or 'J5' in str(v)):
-            status = "CRITICAL"
-            pressure_loss = 0.8
-            flow_velocity = 0.2  # Slow flow at leak
-        elif leak_mode:
-            # Calculate distance-based pressure redistribution
-            status = "REDUCED"
-            pressure_loss = 0.15 + (0.1 * (1 - diameter / 500))  # Smaller pipes affected more
-            flow_velocity = 0.7
-        
-        pipe_flow = base_flow * (1 - pressure_loss)
-        
-        # Color based on status and pipe class
-        if status == "CRITICAL":
-            color = "#ff2a2a"
-            glow = True
-        elif status == "REDUCED":
-            color = "#ffaa00"
-            glow = False
-        else:
-            # Gradient based on pipe class
-            color = "#00f2ff" if pipe_class == "MAIN" else "#00d4aa" if pipe_class == "SECONDARY" else "#00b8d4"
-            glow = False
-        
-        pipe_features.append({
+    # Physics for every pipe at once as array ops over the indexed columns
+    # (leak flags and leak-mode pressure loss are precomputed at load by NetworkSoA)
+    u_idx, v_idx = net.u_idx, net.v_idx
+    diameter = net.diameter
+    
+    critical = leak_mode & net.touches_leak
+    reduced = leak_mode & ~net.touches_leak
+    
+    pressure_loss = net.leak_pressure_loss if leak_mode else np.zeros(len(diameter))
+    flow_velocity = np.select([critical, reduced], [0.2, 0.7], 1.0)  # m/s, slow flow at leak
+    status = np.select([critical, reduced], ["CRITICAL", "REDUCED"], "NORMAL")
+    pipe_flow = base_flow * (1 - pressure_loss)
+    
+    # Color based on status, falling back to the pipe-class gradient
+    color = np.select([critical, reduced], ["#ff2a2a", "#ffaa00"], net.class_color)
+    weight = net.base_weight + 2 * critical
+    
+    pipe_features = [
+        {
             "type": "Feature",
             "geometry": {
                 "type": "LineString",
-                "coordinates": [
-                    [float(node_u.get('longitude', 0)), float(node_u.get('latitude', 0))],
-                    [float(node_v.get('longitude', 0)), float(node_v.get('latitude', 0))]
-                ]
+                "coordinates": [[u_lon, u_lat], [v_lon, v_lat]]
             },
             "properties": {
-                "pipe_id": data.get('pipe_id', f"{u}-{v}"),
-                "from_node": str(u),
-                "to_node": str(v),
+                "pipe_id": pipe_id,
+                "from_node": node_ids[u],
+                "to_node": node_ids[v],
                 "pipe_class": pipe_class,
-                "diameter_mm": diameter,
-                "length_m": round(length, 1),
-                "flow_lpm": round(pipe_flow, 1),
-                "flow_velocity": round(flow_velocity, 2),
-                "pressure_loss_pct": round(pressure_loss * 100, 0),
-                "status": status,
-                "color": color,
-                "weight": base_weight if status != "CRITICAL" else base_weight + 2,
-                "glow": glow,
-                "animated": status != "CRITICAL"  # Animate flow except on broken pipes
+                "diameter_mm": diameter_mm,
+                "length_m": length_m,
+                "flow_lpm": flow_lpm,
+                "flow_velocity": velocity,
+                "pressure_loss_pct": loss_pct,
+                "status": pipe_status,
+                "color": pipe_color,
+                "weight": pipe_weight,
+                "glow": is_critical,
+                "animated": not is_critical  # Animate flow except on broken pipes
             }
-        })
+        }
+        for (u, v, u_lon, u_lat, v_lon, v_lat, pipe_id, pipe_class, diameter_mm, length_m,
+             flow_lpm, velocity, loss_pct, pipe_status, pipe_color, pipe_weight, is_critical) in zip(
+            u_idx.tolist(), v_idx.tolist(),
+            net.lon[u_idx].tolist(), net.lat[u_idx].tolist(),
+            net.lon[v_idx].tolist(), net.lat[v_idx].tolist(),
+            net.pipe_id, net.pipe_class, diameter.tolist(),
+            np.round(net.length, 1).tolist(),
+            np.round(pipe_flow, 1).tolist(),
+            np.round(flow_velocity, 2).tolist(),
+            np.round(pressure_loss * 100, 0).tolist(),
+            status.tolist(), color.tolist(), weight.tolist(), critical.tolist()
+        )
+    ]
     
-    return {
+    # GeoJSON payload goes straight to orjson (no jsonable_encoder walk)
+    return ORJSONResponse({
         "type": "FeatureCollection",
         "features": pipe_features,
         "nodes": node_features,
@@ -764,9 +1404,9 @@ async def get_pipe_network(leak_mode: bool = Query(default=False)):
             "total_nodes": len(node_features),
             "leak_mode": leak_mode,
             "base_flow_lpm": base_flow,
-            "system_efficiency": flow_data['efficiency']
+            "system_efficiency": round(efficiency, 2)
         }
-    }
+    })
 
 
 # =============================================================================
@@ -786,10 +1426,9 @@ async def analyze_satellite(
     2. Temporal Filter: Rain dries up (Decay Curve). Leaks persist (Constant Recharge).
     """
     
-    # Load the "Raw" Satellite Data (The Leak)
+    # Load the "Raw" Satellite Data (The Leak) - served from the in-memory cache
     try:
-        with open(SATELLITE_DATA_PATH, 'r') as f:
-            base_data = json.load(f)
+        base_data = load_json(SATELLITE_DATA_PATH)
     except FileNotFoundError:
         return {"error": "Satellite data source missing"}
 
@@ -829,12 +1468,19 @@ async def analyze_satellite(
         # The Satellite sees ONE wet spot.
         # The System ACCEPTS this as a True Positive.
         
-        leak_features = base_data.get("features", [])
-        
         # Enrich the data with the "Why" logic
-        for feature in leak_features:
-            feature["properties"]["analysis_note"] = "PERSISTENT_SIGNATURE"
-            feature["properties"]["temporal_decay"] = "0%"  # It didn't dry up!
+        # (copies of each feature - base_data is the shared cached object)
+        leak_features = [
+            {
+                **feature,
+                "properties": {
+                    **feature.get("properties", {}),
+                    "analysis_note": "PERSISTENT_SIGNATURE",
+                    "temporal_decay": "0%"  # It didn't dry up!
+                }
+            }
+            for feature in base_data.get("features", [])
+        ]
         
         analysis_report["global_moisture_index"] = 0.05  # Only 5% of city is wet
         analysis_report["signal_type"] = "DIFFERENTIAL"  # Localized signal
@@ -847,10 +1493,28 @@ async def analyze_satellite(
             "CONCLUSION: Infrastructure Failure (Leak)."
         ]
         
-        return {
+        return ORJSONResponse({
             "analysis": analysis_report,
-            "geo_data": base_data
-        }
+            "geo_data": {**base_data, "features": leak_features}
+        })
+
+
+# Static network status payload, serialized once at module load
+_NETWORK_STATUS_BYTES = orjson.dumps({
+    "pump_stations": {
+        "online": 3,
+        "total": 3,
+        "status": "NOMINAL"
+    },
+    "tanks": {
+        "T1": {"level_percent": 72, "status": "NORMAL"},
+        "T2": {"level_percent": 65, "status": "NORMAL"},
+        "T3": {"level_percent": 45, "status": "LOW"}
+    },
+    "active_alerts": 0,
+    "last_sync": "2024-12-11T14:30:00Z",
+    "production_note": "Tank percentages are simulated. Real system would use SCADA integration."
+})
 
 
 @app.get("/network-status")
@@ -858,21 +1522,7 @@ async def network_status():
     """
     Get current water network status.
     """
-    return {
-        "pump_stations": {
-            "online": 3,
-            "total": 3,
-            "status": "NOMINAL"
-        },
-        "tanks": {
-            "T1": {"level_percent": 72, "status": "NORMAL"},
-            "T2": {"level_percent": 65, "status": "NORMAL"},
-            "T3": {"level_percent": 45, "status": "LOW"}
-        },
-        "active_alerts": 0,
-        "last_sync": "2024-12-11T14:30:00Z",
-        "production_note": "Tank percentages are simulated. Real system would use SCADA integration."
-    }
+    return Response(content=_NETWORK_STATUS_BYTES, media_type="application/json")
 
 
 # =============================================================================
@@ -899,4 +1549,5 @@ if __name__ == "__main__":
     print("  🔧 GET /network-status    - Water network status")
     print("  ❤️  GET /health            - Health check")
     print("\n")
+    # Single worker on purpose: tank_state is in-memory (see /health production_note).
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+
+# Tests import the backend module directly (backend/main.py), and data_factory
+# from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent))
+
+import main
+
+
+def write_energy_csv(path, rows=48, seed=0):
+    """Small energy_data.csv with the generator's columns (5-minute timestamps)."""
+    rng = np.random.default_rng(seed)
+    power = rng.normal(45.0, 3.0, rows).round(1)
+    pd.DataFrame({
+        "timestamp": [f"{i * 5 // 60:02d}:{i * 5 % 60:02d}" for i in range(rows)],
+        "power_kw": power,
+        "leak_spike_kw": (power * 1.2).round(1),
+        "voltage_v": rng.normal(400.0, 2.0, rows).round(1),
+        "current_a": rng.normal(75.0, 3.0, rows).round(1),
+        "frequency_hz": rng.normal(50.0, 0.02, rows).round(2),
+        "power_factor": rng.uniform(0.85, 0.95, rows).round(2),
+        "flow_actual_lps": rng.normal(18.0, 1.0, rows).round(1),
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """
+    Point the backend at a temporary data directory (energy CSV + satellite
+    GeoJSON) with empty caches, so tests never read or write data/.
+    """
+    write_energy_csv(tmp_path / "energy_data.csv")
+    (tmp_path / "satellite.json").write_bytes(orjson.dumps({
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [75.7833, 26.9144]},
+            "properties": {"zone_id": "J5"},
+        }],
+    }))
+
+    monkeypatch.setattr(main, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(main, "ENERGY_DATA_PATH", tmp_path / "energy_data.csv")
+    monkeypatch.setattr(main, "USERS_DATA_PATH", tmp_path / "janaadhaar_users.json")
+    monkeypatch.setattr(main, "SATELLITE_DATA_PATH", tmp_path / "satellite.json")
+    monkeypatch.setattr(main, "MODEL_PATH", tmp_path / "iforest.joblib")
+    for name in ("anomaly_model", "network", "_energy_df_cache", "_energy_features", "_energy_mtime"):
+        monkeypatch.setattr(main, name, None)
+    main._load_json.cache_clear()
+    main._satellite_payload.cache_clear()
+    main._users_payload.cache_clear()
+    yield tmp_path
+    main._load_json.cache_clear()
+    main._satellite_payload.cache_clear()
+    main._users_payload.cache_clear()
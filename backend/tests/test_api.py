@@ -0,0 +1,56 @@
+"""
+Endpoint behaviour: response formats and conditional GETs.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture
+def client(data_dir):
+    with TestClient(main.app) as c:
+        yield c
+
+
+def test_columns_format_returns_one_array_per_field(client):
+    response = client.get("/analyze-energy", params={"format": "columns", "limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) >= {"timestamp", "power_kw", "flow_lpm", "is_anomaly", "anomaly_score"}
+    assert all(len(values) == 5 for values in body.values())
+    assert body["timestamp"] == ["03:35", "03:40", "03:45", "03:50", "03:55"]
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get("/analyze-energy", params={"format": "xml"}).status_code == 422
+
+
+def test_json_format_keeps_content_length(client):
+    response = client.get("/analyze-energy")
+    assert response.status_code == 200
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert len(response.json()) == 48
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "W/{etag}",
+    '"other", {etag}',
+    '"other",W/{etag}',
+    "*",
+])
+def test_satellite_zones_not_modified(client, if_none_match):
+    etag = client.get("/satellite-zones").headers["etag"]
+    response = client.get("/satellite-zones", headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("if_none_match", ['"other"', '"other", W/"another"', ""])
+def test_satellite_zones_changed(client, if_none_match):
+    response = client.get("/satellite-zones", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 200
+    assert response.json()["type"] == "FeatureCollection"
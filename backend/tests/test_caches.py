@@ -0,0 +1,78 @@
+"""
+On-disk caches: the GraphML network written by data_factory and the
+persisted IsolationForest.
+"""
+
+import joblib
+import numpy as np
+import pytest
+
+import main
+from conftest import write_energy_csv
+
+data_factory = pytest.importorskip("data_factory")
+
+
+def test_write_graphml_round_trips_through_load_network_soa(tmp_path):
+    nodes = {
+        "R1": {"node_type": "reservoir", "name": "Reservoir", "latitude": 26.93, "longitude": 75.77, "elevation": 420},
+        "J1": {"node_type": "junction", "name": "J1 <Main> & Co", "latitude": 26.92, "longitude": 75.78, "demand": 1.5},
+        "J5": {"node_type": "junction", "name": "J5", "latitude": 26.91, "longitude": 75.78, "elevation": 401.5},
+        "X": {"node_type": "junction", "name": "No coordinates"},
+    }
+    edges = [
+        ("R1", "J1", {"pipe_id": "P1", "diameter": 500, "length": 200}),
+        ("J1", "J5", {"pipe_id": "P2", "diameter": 150.0, "length": 312.5}),
+        ("J5", "X", {"pipe_id": "P3", "diameter": 100, "length": 50}),
+    ]
+    path = tmp_path / "network.graphml"
+    data_factory.write_graphml(nodes, edges, str(path))
+
+    soa = main.load_network_soa(path)
+    assert soa.node_id == ["R1", "J1", "J5"]
+    assert soa.node_type == ["reservoir", "junction", "junction"]
+    assert soa.name == ["Reservoir", "J1 <Main> & Co", "J5"]
+    np.testing.assert_array_equal(soa.lat, [26.93, 26.92, 26.91])
+    np.testing.assert_array_equal(soa.elev, [420, 0, 401.5])
+    np.testing.assert_array_equal(soa.demand, [0, 1.5, 0])
+    assert soa.pipe_id == ["P1", "P2"]
+    np.testing.assert_array_equal(soa.u_idx, [0, 1])
+    np.testing.assert_array_equal(soa.v_idx, [1, 2])
+    np.testing.assert_array_equal(soa.diameter, [500, 150])
+    np.testing.assert_array_equal(soa.length, [200, 312.5])
+
+
+def test_write_graphml_rejects_unsupported_values(tmp_path):
+    with pytest.raises(TypeError):
+        data_factory.write_graphml({"J1": {"tags": ["a"]}}, [], str(tmp_path / "network.graphml"))
+
+
+def test_persisted_model_is_reused_until_its_inputs_change(data_dir, monkeypatch):
+    fits = []
+    fit = main.IsolationForest.fit
+    monkeypatch.setattr(main.IsolationForest, "fit", lambda self, *a, **k: fits.append(1) or fit(self, *a, **k))
+    main.load_energy_data()
+
+    main._load_or_fit_model(48)
+    saved = joblib.load(main.MODEL_PATH)["fingerprint"]
+    assert saved == main._model_fingerprint()
+    assert len(fits) == 1
+
+    # Same settings and data: the persisted model is loaded, not refitted
+    main._load_or_fit_model(48)
+    assert len(fits) == 1
+
+    # Changed hyperparameters invalidate it
+    monkeypatch.setattr(main, "MODEL_PARAMS", {**main.MODEL_PARAMS, "n_estimators": 50})
+    assert main._load_or_fit_model(48).n_estimators == 50
+    assert len(fits) == 2
+    refitted = joblib.load(main.MODEL_PATH)["fingerprint"]
+    assert refitted != saved
+
+    # So does changed data, even with the same settings
+    write_energy_csv(data_dir / "energy_data.csv", seed=1)
+    assert main._model_fingerprint() != refitted
+    main._load_or_fit_model(48)
+    assert len(fits) == 3
+    assert joblib.load(main.MODEL_PATH)["fingerprint"] == main._model_fingerprint()
+    assert not list(data_dir.glob("*.tmp"))
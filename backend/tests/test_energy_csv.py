@@ -0,0 +1,34 @@
+"""
+energy_data.csv parsing must not depend on which CSV engine is installed.
+"""
+
+import pandas as pd
+import pytest
+
+import main
+
+CSV_TEXT = (
+    "timestamp,power_kw,leak_spike_kw,voltage_v,current_a,frequency_hz,power_factor,flow_actual_lps\n"
+    "00:00,31.2,33.0,401.3,78.0,50.01,0.91,18.7\n"
+    "23:50,29.8,30.4,398.6,74.5,49.97,0.88,17.9\n"
+)
+
+
+@pytest.fixture
+def energy_csv(tmp_path):
+    path = tmp_path / "energy_data.csv"
+    path.write_text(CSV_TEXT)
+    return path
+
+
+def test_c_engine_keeps_timestamp_text(energy_csv):
+    df = main.read_energy_csv(energy_csv, engine="c")
+    assert df["timestamp"].tolist() == ["00:00", "23:50"]
+    assert list(df.columns) == main.ENERGY_CSV_COLUMNS
+
+
+def test_pyarrow_engine_matches_c_engine(energy_csv):
+    pytest.importorskip("pyarrow")
+    df = main.read_energy_csv(energy_csv, engine="pyarrow")
+    assert df["timestamp"].tolist() == ["00:00", "23:50"]
+    pd.testing.assert_frame_equal(df, main.read_energy_csv(energy_csv, engine="c"))
@@ -9,9 +9,13 @@ Generates synthetic data for the hackathon demo:
 import pandas as pd
 import numpy as np
 import json
+import hashlib
 import networkx as nx
 from datetime import datetime, timedelta
 import os
+import random
+import sys
+from xml.sax.saxutils import escape, quoteattr
 
 # Ensure data directory exists
 os.makedirs('data', exist_ok=True)
@@ -130,6 +134,11 @@ def generate_janaadhaar_users():
         "MI Road", "Sanganer", "Sitapura", "Vidhyadhar Nagar", "Jhotwara"
     ]
     
+    connection_types = ("Domestic", "Commercial", "Industrial")
+    connection_weights = (0.7, 0.2, 0.1)
+    
+    # Scalar picks from short lists go through the stdlib RNG - np.random.choice
+    # allocates an array per call just to return one element
     users = []
     for i in range(50):
         # Random location within ~5km of Jaipur center
@@ -138,11 +147,11 @@ def generate_janaadhaar_users():
         
         user = {
             "id": f"JA-{10000 + i}",
-            "name": f"{np.random.choice(first_names)} {np.random.choice(last_names)}",
-            "locality": np.random.choice(localities),
+            "name": f"{random.choice(first_names)} {random.choice(last_names)}",
+            "locality": random.choice(localities),
             "lat": round(lat, 6),  # Flat structure for Kepler
             "lon": round(lon, 6),  # Flat structure for Kepler
-            "connection_type": np.random.choice(["Domestic", "Commercial", "Industrial"], p=[0.7, 0.2, 0.1]),
+            "connection_type": random.choices(connection_types, weights=connection_weights)[0],
             "meter_id": f"WM-{np.random.randint(100000, 999999)}",
             "avg_daily_usage_liters": round(np.random.uniform(100, 500), 1),
             "last_bill_amount": round(np.random.uniform(200, 1500), 2),
@@ -161,34 +170,131 @@ def generate_janaadhaar_users():
 # 3. NETWORK GRAPH (PIPE NETWORK)
 # =============================================================================
 
-def generate_network():
+# Bump whenever generate_network's output changes for a given seed,
+# so previously generated network files are rebuilt
+NETWORK_SCHEMA_VERSION = 2
+
+# GraphML attr.type for each Python value type we emit
+_GRAPHML_TYPE_NAMES = {bool: "boolean", int: "long", float: "double", str: "string"}
+
+
+def _graphml_value(value):
+    """Format an attribute value the way GraphML readers expect it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape(str(value))
+
+
+def write_graphml(nodes, edges, path):
+    """
+    Stream an undirected attributed graph to a GraphML file.
+    
+    nodes: {node_id: {attr: value}}, edges: [(u, v, {attr: value})].
+    The schema here is fixed and tiny, so the XML is emitted directly instead of
+    going through NetworkX's tree builder. Like nx.write_graphml, each attribute
+    gets one key per value type it is used with (e.g. int and float pipe lengths),
+    so every value reads back with its original type.
+    
+    Raises:
+        TypeError: If a value is not a bool, int, float or str
+    """
+    keys = {}  # (domain, attr name, attr.type) -> key id, in first-use order
+    for domain, records in (("node", nodes.values()), ("edge", (attrs for _, _, attrs in edges))):
+        for attrs in records:
+            for name, value in attrs.items():
+                attr_type = _GRAPHML_TYPE_NAMES.get(type(value))
+                if attr_type is None:
+                    raise TypeError(f"Unsupported GraphML value for {domain} attribute {name!r}: {value!r}")
+                keys.setdefault((domain, name, attr_type), f"d{len(keys)}")
+    
+    def data_lines(domain, attrs):
+        return "".join(
+            f'      <data key="{keys[(domain, name, _GRAPHML_TYPE_NAMES[type(value)])]}">'
+            f'{_graphml_value(value)}</data>\n'
+            for name, value in attrs.items()
+        )
+    
+    # Written next to the target and renamed into place, so a reader (e.g. a running
+    # backend) never sees a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n"
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+                'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n')
+        f.writelines(
+            f'  <key id="{key_id}" for="{domain}" attr.name="{name}" attr.type="{attr_type}" />\n'
+            for (domain, name, attr_type), key_id in keys.items()
+        )
+        f.write('  <graph edgedefault="undirected">\n')
+        # Elements are streamed to the file as they are formatted - no full document in memory
+        f.writelines(
+            f"    <node id={quoteattr(node_id)}>\n{data_lines('node', attrs)}    </node>\n"
+            for node_id, attrs in nodes.items()
+        )
+        f.writelines(
+            f"    <edge source={quoteattr(u)} target={quoteattr(v)}>\n{data_lines('edge', attrs)}    </edge>\n"
+            for u, v, attrs in edges
+        )
+        f.write("  </graph>\n</graphml>\n")
+    os.replace(tmp_path, path)
+
+
+def _file_digest(path):
+    """Content hash of a generated file, recorded in its cache sidecar."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()[:16]
+
+
+def generate_network(seed=0):
     """
     Generate a synthetic pipe network for Jaipur water distribution.
     Uses NetworkX to create a graph that can be used with WNTR.
+    All randomness comes from one seeded Generator, so a given seed always
+    produces the same network.
     """
     print("🔧 Generating network.graphml...")
     
-    # Create a water distribution network graph
-    G = nx.Graph()
+    junction_count = 20
+    
+    # Same seed, size and generator version -> same file, so skip regeneration.
+    # The sidecar also records a hash of the file, so a truncated or edited
+    # network.graphml is regenerated rather than trusted.
+    cache_key = hashlib.blake2b(
+        f"{junction_count}|{seed}|v{NETWORK_SCHEMA_VERSION}".encode()
+    ).hexdigest()[:12]
+    if os.path.exists('data/network.graphml') and os.path.exists('data/.network.key'):
+        with open('data/.network.key') as f:
+            cached = f.read().split()
+        if cached == [cache_key, _file_digest('data/network.graphml')]:
+            # write_graphml keys every attribute by type, so this reads back the same values and types
+            G = nx.read_graphml('data/network.graphml')
+            print(f"   ✅ data/network.graphml is up to date ({G.number_of_nodes()} nodes, {G.number_of_edges()} pipes)")
+            return G
+    
+    rng = np.random.default_rng(seed)
+    
+    # Node and pipe records for the water distribution network graph
+    nodes = {}
+    edges = []
     
     # Jaipur center
     center = (26.9124, 75.7873)
     
     # Add reservoir/source node
-    G.add_node("R1", 
-               node_type="reservoir",
-               latitude=center[0] + 0.02,
-               longitude=center[1] - 0.02,
-               elevation=350.0,
-               name="Main Reservoir")
+    nodes["R1"] = dict(node_type="reservoir",
+                       latitude=center[0] + 0.02,
+                       longitude=center[1] - 0.02,
+                       elevation=350.0,
+                       name="Main Reservoir")
     
     # Add pump station
-    G.add_node("P1",
-               node_type="pump",
-               latitude=center[0] + 0.015,
-               longitude=center[1] - 0.015,
-               elevation=340.0,
-               name="Central Pump Station")
+    nodes["P1"] = dict(node_type="pump",
+                       latitude=center[0] + 0.015,
+                       longitude=center[1] - 0.015,
+                       elevation=340.0,
+                       name="Central Pump Station")
     
     # Add tank nodes
     tank_positions = [
@@ -198,65 +304,85 @@ def generate_network():
     ]
     
     for tank_id, lat_offset, lon_offset, name in tank_positions:
-        G.add_node(tank_id,
-                   node_type="tank",
-                   latitude=center[0] + lat_offset,
-                   longitude=center[1] + lon_offset,
-                   elevation=330.0,
-                   name=name)
+        nodes[tank_id] = dict(node_type="tank",
+                              latitude=center[0] + lat_offset,
+                              longitude=center[1] + lon_offset,
+                              elevation=330.0,
+                              name=name)
     
     # Add junction nodes (distribution points)
-    junction_count = 20
-    for i in range(junction_count):
-        lat = center[0] + np.random.uniform(-0.03, 0.03)
-        lon = center[1] + np.random.uniform(-0.03, 0.03)
-        
-        G.add_node(f"J{i+1}",
-                   node_type="junction",
-                   latitude=lat,
-                   longitude=lon,
-                   elevation=np.random.uniform(310, 340),
-                   demand=np.random.uniform(10, 50))  # Base demand in LPS
+    # One batched draw per attribute instead of four scalar draws per junction
+    lats = center[0] + rng.uniform(-0.03, 0.03, junction_count)
+    lons = center[1] + rng.uniform(-0.03, 0.03, junction_count)
+    elevs = rng.uniform(310, 340, junction_count)
+    demands = rng.uniform(10, 50, junction_count)  # Base demand in LPS
+    
+    # Junction IDs are formatted once and reused as keys by every pipe and the leak marker
+    junction_ids = [sys.intern(f"J{i+1}") for i in range(junction_count)]
+    
+    # Mark a potential leak location - merged in when its junction is built
+    leak_junction = junction_ids[4]  # J5
+    leak_attrs = {"leak_potential": True, "name": "Suspected Leak Zone"}
+    
+    nodes.update(
+        (jid, dict(node_type="junction", latitude=la, longitude=lo, elevation=el, demand=de,
+                   **(leak_attrs if jid == leak_junction else {})))
+        for jid, la, lo, el, de in zip(junction_ids, lats.tolist(), lons.tolist(),
+                                       elevs.tolist(), demands.tolist())
+    )
     
     # Add pipes (edges)
     # Connect reservoir to pump
-    G.add_edge("R1", "P1", pipe_id="PIPE_R1_P1", diameter=500, length=200, roughness=100)
+    edges.append(("R1", "P1", dict(pipe_id="PIPE_R1_P1", diameter=500, length=200, roughness=100)))
     
     # Connect pump to tanks
-    G.add_edge("P1", "T1", pipe_id="PIPE_P1_T1", diameter=400, length=1500, roughness=100)
-    G.add_edge("P1", "T2", pipe_id="PIPE_P1_T2", diameter=400, length=2000, roughness=100)
-    G.add_edge("P1", "T3", pipe_id="PIPE_P1_T3", diameter=400, length=1800, roughness=100)
-    
-    # Connect tanks to junctions
-    for i in range(1, junction_count + 1):
-        tank = np.random.choice(["T1", "T2", "T3"])
-        diameter = np.random.choice([100, 150, 200, 250])
-        length = np.random.uniform(200, 1000)
-        G.add_edge(tank, f"J{i}", 
-                   pipe_id=f"PIPE_{tank}_J{i}",
-                   diameter=diameter,
-                   length=round(length, 1),
-                   roughness=np.random.uniform(90, 110))
+    edges.append(("P1", "T1", dict(pipe_id="PIPE_P1_T1", diameter=400, length=1500, roughness=100)))
+    edges.append(("P1", "T2", dict(pipe_id="PIPE_P1_T2", diameter=400, length=2000, roughness=100)))
+    edges.append(("P1", "T3", dict(pipe_id="PIPE_P1_T3", diameter=400, length=1800, roughness=100)))
+    
+    # Connect tanks to junctions (attributes drawn up front, like the junctions)
+    tanks = rng.choice(["T1", "T2", "T3"], junction_count).tolist()
+    diameters = rng.choice([100, 150, 200, 250], junction_count)
+    lengths = rng.uniform(200, 1000, junction_count).round(1)
+    roughnesses = rng.uniform(90, 110, junction_count)
+    pipe_ids = [f"PIPE_{tank}_{junction}" for tank, junction in zip(tanks, junction_ids)]
+    
+    edges.extend(
+        (tank, junction, dict(pipe_id=pipe_id, diameter=d, length=le, roughness=ro))
+        for tank, junction, pipe_id, d, le, ro in zip(tanks, junction_ids, pipe_ids, diameters.tolist(),
+                                                      lengths.tolist(), roughnesses.tolist())
+    )
     
     # Add some inter-junction connections for redundancy
-    for i in range(5):
-        j1 = f"J{np.random.randint(1, junction_count + 1)}"
-        j2 = f"J{np.random.randint(1, junction_count + 1)}"
-        if j1 != j2 and not G.has_edge(j1, j2):
-            G.add_edge(j1, j2,
-                       pipe_id=f"PIPE_{j1}_{j2}",
-                       diameter=np.random.choice([100, 150]),
-                       length=np.random.uniform(100, 500),
-                       roughness=100)
-    
-    # Mark a potential leak location
-    leak_junction = "J5"
-    G.nodes[leak_junction]["leak_potential"] = True
-    G.nodes[leak_junction]["name"] = "Suspected Leak Zone"
-    
-    # Save as GraphML
-    nx.write_graphml(G, 'data/network.graphml')
-    print(f"   ✅ Created data/network.graphml ({G.number_of_nodes()} nodes, {G.number_of_edges()} pipes)")
+    # Sample distinct unordered junction pairs in one call - no self-loops or repeats,
+    # and junctions only have tank pipes so far, so none of them already exist
+    redundancy_count = 5
+    pair_i, pair_j = np.triu_indices(junction_count, k=1)
+    picks = rng.choice(len(pair_i), redundancy_count, replace=False)
+    redundancy_diameters = rng.choice([100, 150], redundancy_count)
+    redundancy_lengths = rng.uniform(100, 500, redundancy_count)
+    
+    redundancy_pairs = [(junction_ids[i], junction_ids[j])
+                        for i, j in zip(pair_i[picks].tolist(), pair_j[picks].tolist())]
+    redundancy_ids = [f"PIPE_{j1}_{j2}" for j1, j2 in redundancy_pairs]
+    
+    edges.extend(
+        (j1, j2, dict(pipe_id=pipe_id, diameter=d, length=le, roughness=100))
+        for (j1, j2), pipe_id, d, le in zip(redundancy_pairs, redundancy_ids,
+                                            redundancy_diameters.tolist(), redundancy_lengths.tolist())
+    )
+    
+    # Save as GraphML straight from the records
+    write_graphml(nodes, edges, 'data/network.graphml')
+    with open('data/.network.key.tmp', 'w') as f:
+        f.write(f"{cache_key} {_file_digest('data/network.graphml')}\n")
+    os.replace('data/.network.key.tmp', 'data/.network.key')
+    print(f"   ✅ Created data/network.graphml ({len(nodes)} nodes, {len(edges)} pipes)")
+    
+    # NetworkX graph for callers (e.g. WNTR) - built in bulk, not used for the file
+    G = nx.Graph()
+    G.add_nodes_from(nodes.items())
+    G.add_edges_from(edges)
     
     return G
 
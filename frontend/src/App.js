@@ -39,9 +39,10 @@ const App = () => {
     const fetchData = async () => {
       setIsLoading(true);
       try {
-        // Fetch from FastAPI
-        const res = await fetch(`http://127.0.0.1:8000/analyze-energy?simulate_leak=${leakMode}`);
+        // Fetch from FastAPI (only the rows the chart shows)
+        const res = await fetch(`http://127.0.0.1:8000/analyze-energy?simulate_leak=${leakMode}&limit=50`);
         const data = await res.json();
+        if (data.error) throw new Error(data.error);
 
         setIsConnected(true);
 